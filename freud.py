@@ -18,18 +18,19 @@ import os
 import sys
 import termios
 import tty
+from fcntl import ioctl
+from struct import pack, unpack
 
 gazete_repository = 'https://github.com/ferhatgec/gazete'
 
+_IS_WINDOWS = sys.platform.startswith('win')
+
 escape = 27
 up = 65
 down = 66
 
 
 def get_terminal_size() -> (int, int):
-    from fcntl import ioctl
-    from struct import pack, unpack
-
     with open(os.ctermid(), 'r') as fd:
         packed = ioctl(fd, termios.TIOCGWINSZ, pack('HHHH', 0, 0, 0, 0))
         rows, cols, h_pixels, v_pixels = unpack('HHHH', packed)
@@ -38,281 +39,202 @@ def get_terminal_size() -> (int, int):
 
 
 class FPaperMarkers:
-    START_MARKER = b'\x02'
-    START_MARKER_2 = b'\x46'
-    START_MARKER_3 = b'\x50'
-    START_MARKER_4 = b'\x61'
-    START_MARKER_5 = b'\x67'
-    START_MARKER_6 = b'\x65'
-
-    START_OF_TEXT = b'\x26'
-    END_OF_TEXT = b'\x15'
-
-    STYLE_MARKER = b'\x1A'
-    LIGHT_SET = b'\x30'
-    BOLD_SET = b'\x31'
-    DIM_SET = b'\x32'
-    ITALIC_SET = b'\x33'
-    UNDERLINED_SET = b'\x34'
-    BLINK_SET = b'\x35'
-    RAPID_BLINK_SET = b'\x36'
-
-    COLOR_RESET = b'\x72'
+    START_MARKER = 0x02
+    START_MARKER_2 = 0x46
+    START_MARKER_3 = 0x50
+    START_MARKER_4 = 0x61
+    START_MARKER_5 = 0x67
+    START_MARKER_6 = 0x65
+
+    # The six start markers spell b'\x02FPage'; the header is matched
+    # as one unit before the payload scan.
+    HEADER = bytes((START_MARKER, START_MARKER_2, START_MARKER_3,
+                    START_MARKER_4, START_MARKER_5, START_MARKER_6))
+
+    START_OF_TEXT = 0x26
+    END_OF_TEXT = 0x15
+
+    STYLE_MARKER = 0x1A
+    LIGHT_SET = 0x30
+    BOLD_SET = 0x31
+    DIM_SET = 0x32
+    ITALIC_SET = 0x33
+    UNDERLINED_SET = 0x34
+    BLINK_SET = 0x35
+    RAPID_BLINK_SET = 0x36
+
+    COLOR_RESET = 0x72
 
     # These styles must be rendered by renderer implementation
-    ALIGN_LEFT_SET = b'\x7B'
-    ALIGN_CENTER_SET = b'\x7C'
-    ALIGN_RIGHT_SET = b'\x7D'
-    ALIGN_RESET = b'\x7E'
-
-    def __init__(self):
-        pass
-
-    def is_start_marker(self, ch) -> bool:
-        return True if ch == self.START_MARKER else False
-
-    def is_start_marker_2(self, ch) -> bool:
-        return True if ch == self.START_MARKER_2 else False
-
-    def is_start_marker_3(self, ch) -> bool:
-        return True if ch == self.START_MARKER_3 else False
-
-    def is_start_marker_4(self, ch) -> bool:
-        return True if ch == self.START_MARKER_4 else False
-
-    def is_start_marker_5(self, ch) -> bool:
-        return True if ch == self.START_MARKER_5 else False
-
-    def is_start_marker_6(self, ch) -> bool:
-        return True if ch == self.START_MARKER_6 else False
-
-    def is_start_of_text(self, ch) -> bool:
-        return True if ch == self.START_OF_TEXT else False
-
-    def is_end_of_text(self, ch) -> bool:
-        return True if ch == self.END_OF_TEXT else False
-
-    def is_style_marker(self, ch) -> bool:
-        return True if ch == self.STYLE_MARKER else False
-
-    def is_light_marker(self, ch) -> bool:
-        return True if ch == self.LIGHT_SET else False
-
-    def is_bold_marker(self, ch) -> bool:
-        return True if ch == self.BOLD_SET else False
-
-    def is_dim_marker(self, ch) -> bool:
-        return True if ch == self.DIM_SET else False
-
-    def is_italic_marker(self, ch) -> bool:
-        return True if ch == self.ITALIC_SET else False
-
-    def is_underlined_marker(self, ch) -> bool:
-        return True if ch == self.UNDERLINED_SET else False
-
-    def is_blink_marker(self, ch) -> bool:
-        return True if ch == self.BLINK_SET else False
-
-    def is_rapid_marker(self, ch) -> bool:
-        return True if ch == self.RAPID_BLINK_SET else False
-
-    def is_color_reset(self, ch) -> bool:
-        return True if ch == self.COLOR_RESET else False
-
-    def is_left_align(self, ch) -> bool:
-        return True if ch == self.ALIGN_LEFT_SET else False
-
-    def is_center_align(self, ch) -> bool:
-        return True if ch == self.ALIGN_CENTER_SET else False
-
-    def is_right_align(self, ch) -> bool:
-        return True if ch == self.ALIGN_RIGHT_SET else False
-
-    def is_reset_align(self, ch) -> bool:
-        return True if ch == self.ALIGN_RESET else False
+    ALIGN_LEFT_SET = 0x7B
+    ALIGN_CENTER_SET = 0x7C
+    ALIGN_RIGHT_SET = 0x7D
+    ALIGN_RESET = 0x7E
 
 
 class FPaper_Extract:
+    _STYLE_ANSI = {
+        FPaperMarkers.LIGHT_SET: '\x1b[0m',
+        FPaperMarkers.BOLD_SET: '\x1b[1m',
+        FPaperMarkers.DIM_SET: '\x1b[2m',
+        FPaperMarkers.ITALIC_SET: '\x1b[3m',
+        FPaperMarkers.UNDERLINED_SET: '\x1b[4m',
+        FPaperMarkers.BLINK_SET: '\x1b[5m',
+        FPaperMarkers.COLOR_RESET: '\x1b[0m',
+    }
+
+    # Rapid blink is only rendered on Windows
+    if _IS_WINDOWS:
+        _STYLE_ANSI[FPaperMarkers.RAPID_BLINK_SET] = '\x1b[6m'
+
+    _ALIGN_MODES = {
+        FPaperMarkers.ALIGN_LEFT_SET: 'left',
+        FPaperMarkers.ALIGN_CENTER_SET: 'center',
+        FPaperMarkers.ALIGN_RIGHT_SET: 'right',
+    }
+
+    # A color byte n renders as '\x1b[<n - 10>m'; build every escape
+    # once instead of formatting it per byte.
+    _COLOR_ESC = {data: f'\x1b[{data - 10}m'
+                  for data in (*range(40, 50), *range(100, 110))}
+
     def __init__(self, filename: str):
-        self.check: FPaperMarkers = FPaperMarkers
         self.filename: str = filename
         self.extracted_text: str = ''
-        self.get_align_text: str = ''
-
-        self.is_start_marker = False
-        self.is_start_marker_2 = False
-        self.is_start_marker_3 = False
-        self.is_start_marker_4 = False
-        self.is_start_marker_5 = False
-        self.is_start_marker_6 = False
-
-        self.is_start_of_text = False
-        self.is_end_of_text = False
 
-        self.is_style_marker = False
+        self._chunks = []
+        self._align_chunks = []
 
         self.is_align = False
-        self.is_left_align = False
-        self.is_center_align = False
-        self.is_right_align = False
-        self.is_reset_align = False
+        self._align_mode = ''
+        self._ascii_payload = False
 
         self.__w__, self.__h__ = get_terminal_size()
+        # The terminal width never changes between calls, so the padding
+        # string can be built once and shared by every aligned line.
+        self._pad_full: str = ' ' * self.__w__
 
-    def left(self, width: int, text: str):
-        self.extracted_text += text
+    def _pad(self, width: int) -> str:
+        return self._pad_full if width == self.__w__ else ' ' * width
 
-        for i in range(0, width):
-            self.extracted_text += ' '
+    def left(self, width: int, text: str):
+        self._chunks.append(text)
+        self._chunks.append(self._pad(width))
 
     def center(self, width: int, text: str):
-        for i in range(0, width):
-            self.extracted_text += ' '
-
-        self.extracted_text += text
-
-        for i in range(0, width):
-            self.extracted_text += ' '
+        pad = self._pad(width)
+        self._chunks.append(pad)
+        self._chunks.append(text)
+        self._chunks.append(pad)
 
     def right(self, width: int, text: str):
-        for i in range(0, width * 2):
-            self.extracted_text += ' '
-
-        self.extracted_text += text
+        self._chunks.append(self._pad(width * 2))
+        self._chunks.append(text)
 
     def detect_style(self, ch):
-        from platform import system
-        # Just waiting for 3.10
-        # Not platform specific
-        if self.check.is_light_marker(self.check, ch):
-            if self.is_align:
-                self.get_align_text += '\x1b[0m'
-            else:
-                self.extracted_text += '\x1b[0m'
-        elif self.check.is_bold_marker(self.check, ch):
-            if self.is_align:
-                self.get_align_text += '\x1b[1m'
-            else:
-                self.extracted_text += '\x1b[1m'
-        elif self.check.is_dim_marker(self.check, ch):
+        style = self._STYLE_ANSI.get(ch)
+        if style is not None:
             if self.is_align:
-                self.get_align_text += '\x1b[2m'
+                self._align_chunks.append(style)
             else:
-                self.extracted_text += '\x1b[2m'
-        elif self.check.is_italic_marker(self.check, ch):
-            if self.is_align:
-                self.get_align_text += '\x1b[3m'
-            else:
-                self.extracted_text += '\x1b[3m'
-        elif self.check.is_underlined_marker(self.check, ch):
-            if self.is_align:
-                self.get_align_text += '\x1b[4m'
-            else:
-                self.extracted_text += '\x1b[4m'
-        elif self.check.is_blink_marker(self.check, ch):
-            if self.is_align:
-                self.get_align_text += '\x1b[5m'
-            else:
-                self.extracted_text += '\x1b[5m'
-        elif self.check.is_rapid_marker(self.check, ch):
-            if system() == 'Windows':
-                if self.is_align:
-                    self.get_align_text += '\x1b[6m'
-                else:
-                    self.extracted_text += '\x1b[6m'
-        elif self.check.is_left_align(self.check, ch):
-            self.is_align = True
-
-            self.is_right_align \
-                = self.is_center_align \
-                = self.is_reset_align = False
-            self.is_left_align = True
-        elif self.check.is_center_align(self.check, ch):
-            self.is_align = True
+                self._chunks.append(style)
+            return
 
-            self.is_right_align \
-                = self.is_left_align \
-                = self.is_reset_align = False
-            self.is_center_align = True
-        elif self.check.is_right_align(self.check, ch):
+        align = self._ALIGN_MODES.get(ch)
+        if align is not None:
             self.is_align = True
+            self._align_mode = align
+            return
 
-            self.is_center_align \
-                = self.is_left_align \
-                = self.is_reset_align = False
-            self.is_right_align = True
-        elif self.check.is_reset_align(self.check, ch):
-            if self.is_center_align:
-                self.center(self.__w__, self.get_align_text)
-            elif self.is_left_align:
-                self.left(self.__w__, self.get_align_text)
-            elif self.is_right_align:
-                self.right(self.__w__, self.get_align_text)
+        if ch == FPaperMarkers.ALIGN_RESET:
+            if self._align_mode:
+                getattr(self, self._align_mode)(self.__w__, ''.join(self._align_chunks))
 
             self.is_align = False
+            self._align_mode = ''
+            self._align_chunks = []
+            return
 
-            self.is_center_align \
-                = self.is_left_align \
-                = self.is_reset_align \
-                = self.is_right_align = False
-
-            self.get_align_text = ''
-        elif self.check.is_color_reset(self.check, ch):
+        color = self._COLOR_ESC.get(ch)
+        if color is not None:
             if self.is_align:
-                self.get_align_text += '\x1b[0m'
+                self._align_chunks.append(color)
             else:
-                self.extracted_text += '\x1b[0m'
+                self._chunks.append(color)
+
+    def _append_text(self, raw: bytes):
+        if self._ascii_payload:
+            text = raw.decode('ascii')
         else:
-            data = ord(ch.decode('utf-8', 'ignore'))
-            if (40 <= data <= 49) or (100 <= data <= 109):
-                if self.is_align:
-                    self.get_align_text += f'\x1b[{data - 10}m'
-                else:
-                    self.extracted_text += f'\x1b[{data - 10}m'
-
-    def detect(self, ch):
-        if self.is_style_marker:
-            self.detect_style(ch)
-            self.is_style_marker = False
-            return
+            text = raw.decode('utf-8', 'ignore')
+        if self.is_align:
+            self._align_chunks.append(text)
+        else:
+            self._chunks.append(text)
 
-        if not self.is_start_marker:
-            self.is_start_marker = self.check.is_start_marker(self.check, ch)
-        elif not self.is_start_marker_2:
-            self.is_start_marker_2 = self.check.is_start_marker_2(self.check, ch)
-        elif not self.is_start_marker_3:
-            self.is_start_marker_3 = self.check.is_start_marker_3(self.check, ch)
-        elif not self.is_start_marker_4:
-            self.is_start_marker_4 = self.check.is_start_marker_4(self.check, ch)
-        elif not self.is_start_marker_5:
-            self.is_start_marker_5 = self.check.is_start_marker_5(self.check, ch)
-        elif not self.is_start_marker_6:
-            self.is_start_marker_6 = self.check.is_start_marker_6(self.check, ch)
-        elif not self.is_start_of_text:
-            self.is_start_of_text = self.check.is_start_of_text(self.check, ch)
-        elif self.is_start_of_text:
-            if self.check.is_style_marker(self.check, ch):
-                self.is_style_marker = True
-                return
-
-            if self.check.is_end_of_text(self.check, ch):
-                self.is_end_of_text = True
-                return
+    def detect(self, payload: bytes):
+        pos = 0
+        length = len(payload)
 
-            if self.is_align:
-                self.get_align_text += ch.decode('utf-8', 'ignore')
-            else:
-                self.extracted_text += ch.decode('utf-8', 'ignore')
+        while pos < length:
+            marker = payload.find(FPaperMarkers.STYLE_MARKER, pos)
+            if marker < 0:
+                self._append_text(payload[pos:])
+                break
 
-    def extract(self):
-        with open(self.filename, 'rb') as file:
-            byte = file.read(1)
-            while byte:
-                if self.is_end_of_text:
-                    break
-                self.detect(byte)
-                byte = file.read(1)
+            if marker > pos:
+                self._append_text(payload[pos:marker])
+
+            if marker + 1 < length:
+                self.detect_style(payload[marker + 1])
+            pos = marker + 2
 
+    def extract(self):
+        # fpaper files are small; one raw read avoids the BufferedReader
+        # layer entirely.
+        fd = os.open(self.filename, os.O_RDONLY)
+        try:
+            data = os.read(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+
+        # Match the header and the start-of-text marker up front so the
+        # payload scan only ever sees text and style bytes.
+        header = data.find(FPaperMarkers.HEADER)
+        if header < 0:
+            return self.extracted_text
+
+        start = data.find(FPaperMarkers.START_OF_TEXT, header + len(FPaperMarkers.HEADER))
+        if start < 0:
+            return self.extracted_text
+
+        payload = data[start + 1:]
+
+        # Find the terminator the way the sequential scan would: jump
+        # over marker/argument pairs from the left, so an end-of-text
+        # byte only counts as a style argument when it actually sits in
+        # the argument slot of a pair.
+        end = len(payload)
+        pos = 0
+        eot = payload.find(FPaperMarkers.END_OF_TEXT)
+        while eot >= 0:
+            marker = payload.find(FPaperMarkers.STYLE_MARKER, pos, eot)
+            if marker < 0:
+                end = eot
+                break
+
+            pos = marker + 2
+            if eot < pos:
+                eot = payload.find(FPaperMarkers.END_OF_TEXT, pos)
+        payload = payload[:end]
+
+        # Most documents are plain ASCII; checking once up front lets
+        # every text run take CPython's one-byte-kind decode path.
+        self._ascii_payload = payload.isascii()
+
+        self.detect(payload)
+
+        self.extracted_text = ''.join(self._chunks)
         return self.extracted_text
 
 
@@ -326,7 +248,15 @@ class Totem:
         self.extract = FPaper_Extract(filename)
         self.file_data = self.extract.extract()
 
-        self.__down__ = len(self.file_data.splitlines())
+        self._lines = self.file_data.splitlines()
+        self.__down__ = len(self._lines)
+
+        # Rendered form plus cumulative line-start offsets: a page is
+        # then one slice of _rendered instead of a per-keystroke join.
+        self._rendered = '\n'.join(self._lines) + '\n' if self._lines else ''
+        self._offsets = [0]
+        for line in self._lines:
+            self._offsets.append(self._offsets[-1] + len(line) + 1)
 
         self.__full_length__ = self.__down__
         self.__w__, self.__h__ = get_terminal_size()
@@ -339,18 +269,26 @@ class Totem:
         self.__down__ = (self.__h__ / 3.95)
         self.__from__(False)
         self.disable_cursor()
+        sys.stdout.flush()
 
         self.new__[3] = self.new__[3] & ~termios.ECHO
+        fd = sys.stdin.fileno()
         try:
-            termios.tcsetattr(sys.stdin.fileno(), termios.TCSANOW, self.new__)
+            termios.tcsetattr(fd, termios.TCSANOW, self.new__)
+            # Enter cbreak mode once for the whole event loop - unlike
+            # setraw it leaves output post-processing (\n -> \r\n)
+            # intact; the finally block restores the saved settings.
+            tty.setcbreak(fd)
             while True:
                 ch = self.getchar()
 
                 if ch.lower() == 'q':
                     break
 
-                ch = self.getchar()
-                ch = self.getchar()
+                if ch != '\x1b':
+                    continue
+
+                ch = sys.stdin.read(2)[-1:]
                 if ch == 'A':
                     if 1 <= self.__up__:
                         self.__up__ -= 1
@@ -366,63 +304,47 @@ class Totem:
         finally:
             self.enable_cursor()
             self.clear()
+            sys.stdout.flush()
             termios.tcsetattr(sys.stdin.fileno(), termios.TCSANOW, self.old__)
 
     def __from__(self, is_up: bool):
-        i = 0
-        __new: str = ''
-        if is_up:
-            for line in self.file_data.splitlines():
-                if i >= self.__up__:
-                    __new += f'{line}\n'
-
-            i += 1
-        else:
-            for line in self.file_data.splitlines():
-                if i < self.__down__:
-                    __new += f'{line}\n'
-
-                i += 1
+        total = len(self._lines)
+        up = min(self.__up__, total)
+        down = total if is_up else min(int(self.__down__), total)
 
-        self.clear()
-        print(end=__new)
-        self.up_to(self.__up__)
+        page = self._rendered[self._offsets[up]:self._offsets[down]] if down > up else ''
+        sys.stdout.write(f'\x1b[2J\x1b[H{page}\x1b[{self.__up__}A')
+        sys.stdout.flush()
 
     @staticmethod
     def getchar():
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1)
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return ch
+        # Raw mode is set once in init_buffer, so this is a plain read
+        return sys.stdin.read(1)
 
     @staticmethod
     def refresh():
-        print(end='\x1b[2J')
+        sys.stdout.write('\x1b[2J')
 
     @staticmethod
     def clear():
-        Totem.refresh()
-        print(end='\x1b[H')
+        # Erase and home the cursor with one write instead of two
+        sys.stdout.write('\x1b[2J\x1b[H')
 
     @staticmethod
     def to_up():
-        print(end='\x1b[0A')
+        sys.stdout.write('\x1b[0A')
 
     @staticmethod
     def up_to(n: int):
-        print(end='\x1b[' + str(n) + 'A')
+        sys.stdout.write('\x1b[' + str(n) + 'A')
 
     @staticmethod
     def disable_cursor():
-        print(end='\x1b[?25l')
+        sys.stdout.write('\x1b[?25l')
 
     @staticmethod
     def enable_cursor():
-        print(end='\x1b[?25h')
+        sys.stdout.write('\x1b[?25h')
 
 
 if len(sys.argv) < 2: